@@ -1,25 +1,44 @@
 import sys
 import re
-import json
 import time
 import mmap
+import marshal
 import os
 import asyncio
+import signal
 import hashlib
+import sqlite3
 import argparse
-from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from bisect import bisect_left
+from itertools import chain, groupby
+from operator import itemgetter
 from functools import lru_cache
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
+from rich.markup import escape
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich import print as rprint
 from .utils.duplicate_finder import DuplicateFinder
 from .utils.web_scanner import download_and_scan_website
-from difflib import SequenceMatcher
+from .utils.regex_trie import words_regex
+from .utils.json_io import write_json
 from typing import Dict, List, Set, Optional, Tuple
 
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import uvloop
+except ImportError:  # optional, see the "fast" extra; not available on Windows
+    uvloop = None
+
 console = Console()
 
 BANNER = r"""
@@ -57,13 +76,45 @@ SUPPORTED_EXTENSIONS = {
     ".html", ".xml", ".sql", ".md", ".conf", ".properties"
 }
 
-EXCLUDE_DIRS = {".git", "__pycache__", "venv", "node_modules", ".vscode"}
+# Lowercase extensions without the dot, as compared against file names during the walk
+EXT_NO_DOT = frozenset(ext[1:] for ext in SUPPORTED_EXTENSIONS)
+
+EXCLUDE_DIRS = frozenset({".git", "__pycache__", "venv", "node_modules", ".vscode"})
+
+MAX_FILE_SIZE = 50 * 1024 * 1024
+
+# Seconds a worker may spend on one file before it is skipped; off by default so large files keep their findings
+FILE_SCAN_TIMEOUT = 0
+
+CUSTOM_DOMAIN_NAME = "Custom Domain URL"
+CUSTOM_DOMAIN_SEVERITY = "medium"
+
+# Above this many alternatives a literal check costs more than the regex pass it could skip
+MAX_LITERAL_ALTERNATIVES = 16
+
+# UTF-16 surrogate code points, which \uD83D-style escapes decode to and UTF-8 cannot encode
+SURROGATE_RE = re.compile('[\ud800-\udfff]')
 
 OUTPUT_DIR = Path('output')
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 PATTERNS = None
 
+MADVISE_HINTS = tuple(getattr(mmap, name) for name in ('MADV_SEQUENTIAL', 'MADV_WILLNEED')
+                      if hasattr(mmap, name))
+
+# Files smaller than this are read with one os.read() call instead of being mapped
+SMALL_FILE_SIZE = 64 * 1024
+
+# O_BINARY keeps Windows from translating line endings in os.read()
+READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# Bytes expected in text files; anything else in a file's first block counts as binary noise
+TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+
+# Characters that re.IGNORECASE matches to ASCII letters but str.casefold() keeps apart
+CASEFOLD_FIXES = str.maketrans({'İ': 'i', 'ı': 'i'})
+
 def display_results_optimized(results):
     console.print("\n" + "=" * 60)
     console.print("[bold cyan][🔍] SCAN RESULTS[/bold cyan]", justify="center")
@@ -72,16 +123,13 @@ def display_results_optimized(results):
         console.print("[green][✓] No sensitive data found[/green]")
         return
     severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    results_by_severity = {}
-    for item in results:
-        severity = item.get("severity", "medium")
-        if severity not in results_by_severity:
-            results_by_severity[severity] = {}
-        item_type = item["type"]
-        if item_type not in results_by_severity[severity]:
-            results_by_severity[severity][item_type] = []
-        results_by_severity[severity][item_type].append(item)
-    for severity in sorted(results_by_severity.keys(), key=lambda x: severity_order.get(x, 99)):
+    def severity_of(item):
+        return item.get("severity", "medium")
+    def display_order(item):
+        severity = severity_of(item)
+        return severity_order.get(severity, 99), severity, item["type"]
+    ordered = sorted(results, key=display_order)
+    for severity, severity_items in groupby(ordered, key=severity_of):
         severity_color = {
             "critical": "red bold",
             "high": "red",
@@ -89,176 +137,400 @@ def display_results_optimized(results):
             "low": "blue"
         }.get(severity, "white")
         console.print(f"\n[{severity_color}]═══ {severity.upper()} SEVERITY ═══[/{severity_color}]")
-        for item_type, items in results_by_severity[severity].items():
+        for item_type, type_items in groupby(severity_items, key=itemgetter("type")):
+            items = list(type_items)
             color = COLORS.get(item_type, COLORS["Default"])
-            console.print(f"\n[bold][{color}]{item_type}[/][/bold] ({len(items)} found)")
+            console.print(f"\n[bold][{color}]{escape(item_type)}[/][/bold] ({len(items)} found)")
             table = Table(show_header=True, header_style="bold magenta")
             table.add_column("File", style="cyan")
             table.add_column("Line", justify="right", style="green")
             table.add_column("Snippet", style="white")
+            # Text cells are not parsed as markup, so brackets in snippets are shown as-is
             for item in items:
                 table.add_row(
-                    item["file"],
-                    str(item["line"]),
-                    item["snippet"]
+                    Text(item["file"]),
+                    Text(str(item["line"])),
+                    Text(item["snippet"])
                 )
             console.print(table)
 
 class OptimizedScanner:
-    def __init__(self, custom_domains=None, max_workers=None, cache_dir=None, search_term=None):
+    def __init__(self, custom_domains=None, max_workers=None, cache_dir=None, search_term=None, cache_hash=False,
+                 file_timeout=FILE_SCAN_TIMEOUT):
         global PATTERNS
         if PATTERNS is None:
             raise ValueError("PATTERNS not initialized. Make sure main_async() was called first.")
         self.compiled_patterns = self._compile_patterns()
-        self.custom_domain_pattern = self._compile_custom_domains(custom_domains)
+        self.severity_by_pattern = {name: self._get_severity(name) for name, _ in self.compiled_patterns}
+        custom_domain_pattern = self._compile_custom_domains(custom_domains)
+        if custom_domain_pattern:
+            self.compiled_patterns += ((CUSTOM_DOMAIN_NAME, custom_domain_pattern),)
+            self.severity_by_pattern[CUSTOM_DOMAIN_NAME] = CUSTOM_DOMAIN_SEVERITY
+        self.required_literals = self._extract_required_literals()
+        self.word_shapes, self.word_shape_pattern = self._extract_word_shapes()
         self.file_cache = {}
-        self.max_workers = max_workers or (os.cpu_count() * 2)
+        # Scanning is CPU-bound, so more workers than cores only adds contention
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.cache_dir = cache_dir
         self.search_term = search_term
+        self.cache_hash = cache_hash
+        self.file_timeout = file_timeout
         if cache_dir:
             os.makedirs(cache_dir, exist_ok=True)
-        self.process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.cache_db = self._open_cache()
+        self.cache_salt = self._get_cache_salt() if self.cache_db is not None else None
+    @cached_property
+    def process_pool(self):
+        # Started on first use, so runs served entirely from the cache spawn no workers
+        return ProcessPoolExecutor(max_workers=self.max_workers,
+                                   initializer=_init_scan_worker, initargs=(self,))
+    def __getstate__(self):
+        # Worker processes get the compiled patterns, not the pool or the cache connection
+        state = self.__dict__.copy()
+        state.pop('process_pool', None)
+        state['cache_db'] = None
+        return state
     def _compile_patterns(self):
-        compiled = {}
-        for name, pattern in PATTERNS.items():
-            if isinstance(pattern, str):
-                flags = re.IGNORECASE | re.MULTILINE
-                compiled[name] = re.compile(pattern, flags)
+        return _compile_all(id(PATTERNS))
+    def _extract_required_literals(self):
+        literals = {}
+        for name, pattern in self.compiled_patterns:
+            alternatives = self._required_literals(pattern)
+            if alternatives:
+                ignore_case = bool(pattern.flags & re.IGNORECASE)
+                if ignore_case:
+                    alternatives = tuple(dict.fromkeys(self._fold_case(text) for text in alternatives))
+                # An alternative containing a shorter one adds nothing to the check
+                alternatives = tuple(text for text in alternatives
+                                     if not any(other != text and other in text for other in alternatives))
+                literals[name] = (alternatives, ignore_case)
+        return literals
+    def _required_literals(self, pattern):
+        # Literals of which every match of the pattern must contain at least one
+        if not isinstance(pattern.pattern, str):
+            return None
+        try:
+            parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+        except Exception:
+            return None
+        return self._sequence_literals(parsed)
+    def _sequence_literals(self, items):
+        best = None
+        def consider(candidate):
+            nonlocal best
+            if not candidate or len(candidate) > MAX_LITERAL_ALTERNATIVES:
+                return
+            if min(map(len, candidate)) < 2:
+                return
+            if best is None or (min(map(len, candidate)), -len(candidate)) > (min(map(len, best)), -len(best)):
+                best = candidate
+        run = []
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            if op is sre_parse.AT:
+                # Zero-width assertions do not split the matched text
+                continue
+            if run:
+                consider(("".join(run),))
+                run = []
+            if op is sre_parse.SUBPATTERN:
+                _, add_flags, del_flags, sub_items = av
+                if not add_flags and not del_flags:
+                    consider(self._sequence_literals(sub_items))
+            elif op is sre_parse.BRANCH:
+                branches = [self._sequence_literals(branch) for branch in av[1]]
+                if all(branches):
+                    consider(tuple(dict.fromkeys(text for branch in branches for text in branch)))
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                consider(self._sequence_literals(av[2]))
+        if run:
+            consider(("".join(run),))
+        return best
+    def _extract_word_shapes(self):
+        # Patterns such as \b[A-Fa-f0-9]{32}\b match exactly the whole words of that length and
+        # alphabet, so one pass over the words of all shared lengths tells which of them can match
+        shapes = {}
+        for name, pattern in self.compiled_patterns:
+            shape = self._word_shape(pattern)
+            if shape:
+                shapes[name] = shape
+        if len(shapes) < 2:
+            return {}, None
+        lengths = [length for length, _ in shapes.values()]
+        chars = frozenset().union(*(chars for _, chars in shapes.values()))
+        words = re.compile(r'\b[%s]{%d,%d}\b' % (''.join(map(re.escape, sorted(chars))), min(lengths), max(lengths)))
+        return shapes, words
+    def _word_shape(self, pattern):
+        # (length, alphabet) of a pattern that is one fixed-length character class between two \b's
+        if not isinstance(pattern.pattern, str) or pattern.flags & (re.IGNORECASE | re.ASCII):
+            return None
+        try:
+            parsed = list(sre_parse.parse(pattern.pattern, pattern.flags))
+        except Exception:
+            return None
+        boundary = (sre_parse.AT, sre_parse.AT_BOUNDARY)
+        if len(parsed) != 3 or parsed[0] != boundary or parsed[2] != boundary:
+            return None
+        op, av = parsed[1]
+        if op is not sre_parse.MAX_REPEAT or av[0] != av[1] or len(av[2]) != 1 or av[2][0][0] is not sre_parse.IN:
+            return None
+        chars = set()
+        for item_op, item_av in av[2][0][1]:
+            if item_op is sre_parse.LITERAL:
+                chars.add(chr(item_av))
+            elif item_op is sre_parse.RANGE:
+                chars.update(map(chr, range(item_av[0], item_av[1] + 1)))
             else:
-                compiled[name] = pattern
-        return compiled
+                return None
+        # Only a run of word characters between \b's is a whole word
+        if not all(char.isascii() and (char.isalnum() or char == '_') for char in chars):
+            return None
+        return av[0], frozenset(chars)
+    def _fold_case(self, text):
+        # translate() goes through the text one character at a time; most texts have nothing to fix
+        if 'İ' in text or 'ı' in text:
+            text = text.translate(CASEFOLD_FIXES)
+        return text.casefold()
+    def _candidate_patterns(self, content):
+        folded_content = None
+        shape_words = None
+        for pattern_name, pattern in self.compiled_patterns:
+            shape = self.word_shapes.get(pattern_name)
+            if shape is not None:
+                if shape_words is None:
+                    shape_words = self.word_shape_pattern.findall(content)
+                length, chars = shape
+                if not any(len(word) == length and chars.issuperset(word) for word in shape_words):
+                    continue
+            literal = self.required_literals.get(pattern_name)
+            if literal is not None:
+                alternatives, ignore_case = literal
+                if ignore_case:
+                    if folded_content is None:
+                        folded_content = self._fold_case(content)
+                    haystack = folded_content
+                else:
+                    haystack = content
+                if not any(text in haystack for text in alternatives):
+                    continue
+            yield pattern_name, pattern
     def _compile_custom_domains(self, domains):
         if not domains:
             return None
-        escaped = "|".join(re.escape(d.strip()) for d in domains if d.strip())
-        if not escaped:
+        domains = [d.lower() for d in map(str.strip, domains) if d]
+        if not domains:
             return None
-        pattern = rf"https?://(?:[\w-]+\.)*(?:{escaped})(?::\d+)?(?:/\S*)?"
+        pattern = rf"https?://(?:[\w-]+\.)*(?:{words_regex(domains)})(?::\d+)?(?:/\S*)?"
         return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-    def _get_file_hash(self, file_path):
+    def _open_cache(self):
+        if not self.cache_dir:
+            return None
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception:
+            cache_db = sqlite3.connect(os.path.join(self.cache_dir, "cache.db"))
+            cache_db.execute("CREATE TABLE IF NOT EXISTS findings (key TEXT PRIMARY KEY, results BLOB)")
+            return cache_db
+        except sqlite3.Error as e:
+            console.print(f"[yellow][WARNING] Cache disabled, cannot open {self.cache_dir}: {e}[/yellow]")
             return None
-    def _get_cache_path(self, file_path):
-        if not self.cache_dir:
+    def _get_cache_salt(self):
+        # Findings depend on the pattern set and scan options, not only on the file
+        hasher = hashlib.blake2b(digest_size=8)
+        for name, pattern in self.compiled_patterns:
+            hasher.update(f"{name}\0{pattern.pattern}\0{pattern.flags}\0".encode('utf-8', 'surrogatepass'))
+        hasher.update(f"\0{self.search_term or ''}".encode('utf-8'))
+        return hasher.hexdigest()
+    def _get_cache_key(self, file_path, rel_path, decode_unicode=False):
+        if self.cache_db is None:
             return None
-        file_hash = self._get_file_hash(file_path)
-        if not file_hash:
+        # Decoded and raw scans of the same file produce different findings
+        salt = f"{self.cache_salt}:u" if decode_unicode else self.cache_salt
+        try:
+            if self.cache_hash:
+                return f"{salt}:h:{self._get_file_hash(file_path)}:{rel_path}"
+            st = os.stat(file_path)
+        except OSError:
             return None
-        return os.path.join(self.cache_dir, f"{file_hash}.json")
-    def _load_from_cache(self, file_path):
-        cache_path = self._get_cache_path(file_path)
-        if not cache_path or not os.path.exists(cache_path):
+        return f"{salt}:{st.st_size:x}:{st.st_mtime_ns:x}:{file_path}:{rel_path}"
+    def _get_file_hash(self, file_path):
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+        return hasher.hexdigest()
+    def _load_from_cache(self, cache_key):
+        if not cache_key:
             return None
         try:
-            with open(cache_path, 'r') as f:
-                return json.load(f)
+            row = self.cache_db.execute("SELECT results FROM findings WHERE key = ?", (cache_key,)).fetchone()
+            return marshal.loads(row[0]) if row else None
         except Exception:
             return None
-    def _save_to_cache(self, file_path, results):
-        cache_path = self._get_cache_path(file_path)
-        if not cache_path:
+    def _save_to_cache(self, cache_key, results):
+        if not cache_key:
             return
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(results, f)
+            self.cache_db.execute("INSERT OR REPLACE INTO findings VALUES (?, ?)", (cache_key, marshal.dumps(results)))
         except Exception:
             pass
-    @lru_cache(maxsize=1000)
-    def _should_skip_file(self, file_path_str):
-        path = Path(file_path_str)
-        try:
-            if path.stat().st_size > 50 * 1024 * 1024:
-                return True
-        except OSError:
-            return True
-        return any(excl in path.parts for excl in EXCLUDE_DIRS)
-    async def _read_file_async(self, file_path):
+    def close(self):
+        process_pool = self.__dict__.pop('process_pool', None)
+        if process_pool is not None:
+            process_pool.shutdown()
+        if self.cache_db is not None:
+            try:
+                self.cache_db.commit()
+                self.cache_db.close()
+            except sqlite3.Error:
+                pass
+            self.cache_db = None
+    def _read_file(self, file_path):
         try:
-            file_size = file_path.stat().st_size
-            with file_path.open('rb') as f:
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    if file_size > 10 * 1024 * 1024:
-                        buffer_size = 1024 * 1024
-                        content = bytearray()
-                        while True:
-                            chunk = mm.read(buffer_size)
-                            if not chunk:
-                                break
-                            content.extend(chunk)
-                            await asyncio.sleep(0)
-                        return content.decode('utf-8', errors='ignore')
-                    else:
-                        return mm.read().decode('utf-8', errors='ignore')
+            fd = os.open(file_path, READ_FLAGS)
+            try:
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    return ""
+                if size < SMALL_FILE_SIZE:
+                    # Setting up a mapping costs more than one read() for small files
+                    data = os.read(fd, size)
+                    if self._looks_binary(data[:8192]):
+                        return ""
+                    return str(data, 'utf-8', 'ignore')
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    # The whole mapping is read once, front to back
+                    for advice in MADVISE_HINTS:
+                        mm.madvise(advice)
+                    if self._looks_binary(mm[:8192]):
+                        return ""
+                    # Decode straight from the mapping instead of copying it into bytes first
+                    return str(mm, 'utf-8', 'ignore')
+            finally:
+                os.close(fd)
         except Exception as e:
             console.print(f"[yellow][WARNING] Cannot read {file_path}: {e}[/yellow]")
-            return ""
-    def _find_line_number(self, content, position):
-        return content[:position].count('\n') + 1
+            return None
+    def _looks_binary(self, head):
+        # Same heuristic as git and file(1): a NUL byte or mostly control bytes
+        if b'\x00' in head:
+            return True
+        return len(head.translate(None, TEXT_BYTES)) > len(head) * 0.3
+    def _newline_offsets(self, content):
+        offsets = []
+        position = content.find('\n')
+        while position != -1:
+            offsets.append(position)
+            position = content.find('\n', position + 1)
+        return offsets
+    def _find_line_number(self, newline_offsets, position):
+        return bisect_left(newline_offsets, position) + 1
     async def analyze_file_async(self, file_path, base_path, decode_unicode=False):
-        if self._should_skip_file(str(file_path)):
-            return []
-        cached_results = self._load_from_cache(file_path)
-        if cached_results is not None:
-            return cached_results
+        return await self.analyze_batch_async([file_path], base_path, decode_unicode)
+    async def analyze_batch_async(self, file_paths, base_path, decode_unicode=False):
+        """
+        Scans a batch of files in one process pool call; cached files are not sent to the pool.
+        """
+        findings = []
+        pending = []
+        try:
+            for file_path in file_paths:
+                rel_path = os.path.relpath(file_path, base_path)
+                cache_key = self._get_cache_key(file_path, rel_path, decode_unicode)
+                cached_results = self._load_from_cache(cache_key)
+                if cached_results is not None:
+                    findings.extend(cached_results)
+                else:
+                    pending.append((file_path, rel_path, cache_key))
+            if not pending:
+                return findings
+            loop = asyncio.get_running_loop()
+            batch_results = await loop.run_in_executor(self.process_pool, _scan_batch_in_worker,
+                                                       [item[:2] for item in pending], decode_unicode)
+            for (_, _, cache_key), file_findings in zip(pending, batch_results):
+                if file_findings is None:
+                    continue
+                self._save_to_cache(cache_key, file_findings)
+                findings.extend(file_findings)
+            return findings
+        except Exception as e:
+            console.print(f"[red][ERROR] Error processing files: {e}[/red]")
+            return findings
+    def scan_file(self, file_path, rel_path, decode_unicode=False):
+        """
+        Scans one file synchronously; runs inside the process pool workers.
+        Returns None when the file could not be read.
+        """
         try:
-            # Decode file before analysis if option is enabled
+            content = self._read_file(file_path)
+            if content is None:
+                return None
             if decode_unicode:
-                decode_file(str(file_path))
-                
-            content = await self._read_file_async(file_path)
+                content = decode_string(content)
             if not content:
                 return []
-            rel_path = str(file_path.relative_to(base_path))
             findings = []
-            seen_hashes = set()
             if self.search_term:
-                for match in re.finditer(re.escape(self.search_term), content):
-                    line_num = self._find_line_number(content, match.start())
+                position = content.find(self.search_term)
+                if position == -1:
+                    return findings
+                newline_offsets = self._newline_offsets(content)
+                # Every hit is the search term itself, so they all share one snippet
+                snippet = self.search_term.strip()
+                while position != -1:
                     findings.append({
                         'file': rel_path,
-                        'line': line_num,
+                        'line': self._find_line_number(newline_offsets, position),
                         'type': 'User Search',
                         'severity': 'info',
-                        'snippet': content[match.start():match.end()].strip(),
-                        'hash': hashlib.md5(content[match.start():match.end()].encode()).hexdigest()
+                        'snippet': snippet
                     })
+                    position = content.find(self.search_term, position + len(self.search_term))
             else:
-                for pattern_name, pattern in self.compiled_patterns.items():
-                    for match in pattern.finditer(content):
-                        line_num = self._find_line_number(content, match.start())
-                        snippet = match.group(0)[:100]
-                        finding_hash = hash((pattern_name, rel_path, line_num, snippet))
-                        if finding_hash not in seen_hashes:
-                            seen_hashes.add(finding_hash)
-                            findings.append({
-                                "type": pattern_name,
-                                "file": rel_path,
-                                "line": line_num,
-                                "snippet": snippet,
-                                "severity": self._get_severity(pattern_name)
-                            })
-                if self.custom_domain_pattern:
-                    for match in self.custom_domain_pattern.finditer(content):
-                        line_num = self._find_line_number(content, match.start())
-                        snippet = match.group(0)[:100]
-                        finding_hash = hash(("Custom Domain URL", rel_path, line_num, snippet))
-                        if finding_hash not in seen_hashes:
-                            seen_hashes.add(finding_hash)
-                            findings.append({
-                                "type": "Custom Domain URL",
-                                "file": rel_path,
-                                "line": line_num,
-                                "snippet": snippet,
-                                "severity": "medium"
-                            })
-            self._save_to_cache(file_path, findings)
+                self._check_patterns(content, rel_path, findings)
             return findings
+        except ScanTimeout:
+            raise
         except Exception as e:
             console.print(f"[red][ERROR] Error processing file: {e}[/red]")
             return []
+    def _check_patterns(self, content, rel_path, findings):
+        # The newline table is only built once some pattern actually matches
+        newline_offsets = None
+        for pattern_name, pattern in self._candidate_patterns(content):
+            matches = pattern.finditer(content)
+            first_match = next(matches, None)
+            if first_match is None:
+                continue
+            if newline_offsets is None:
+                newline_offsets = self._newline_offsets(content)
+            self._collect_matches(pattern_name, chain((first_match,), matches),
+                                  self.severity_by_pattern[pattern_name], newline_offsets, rel_path, findings)
+    def _collect_matches(self, pattern_name, matches, severity, newline_offsets, rel_path, findings):
+        # Name and file are fixed for this call, so (line, snippet) identifies a finding.
+        # finditer goes forward through the file, so only the current line's snippets can repeat.
+        current_line = 0
+        line_snippets = None
+        for match in matches:
+            line_num = self._find_line_number(newline_offsets, match.start())
+            snippet = match.group(0)[:100]
+            if line_num != current_line:
+                current_line = line_num
+                line_snippets = {snippet}
+            elif snippet in line_snippets:
+                continue
+            else:
+                line_snippets.add(snippet)
+            findings.append({
+                "type": pattern_name,
+                "file": rel_path,
+                "line": line_num,
+                "snippet": snippet,
+                "severity": severity
+            })
     def _get_severity(self, pattern_name):
         critical = ["Private Key PEM", "Password", "Credit Card", "API Key"]
         high = ["JWT Token", "Certificate", "Bank Account"]
@@ -270,48 +542,167 @@ class OptimizedScanner:
         else:
             return "medium"
 
-async def scan_directory_async(path, extensions=None, decode_unicode=False):
+@lru_cache(maxsize=None)
+def _compile_all(patterns_id):
+    # Keyed by id(): pattern sets are module-level dicts that live as long as the process
+    compiled = []
+    for name, pattern in PATTERNS.items():
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        compiled.append((name, pattern))
+    return tuple(compiled)
+
+_WORKER_SCANNER = None
+
+class ScanTimeout(Exception):
+    """Raised in a worker when one file runs past the scanner's file_timeout."""
+
+def _raise_scan_timeout(signum, frame):
+    raise ScanTimeout()
+
+def _worker_timeout():
+    # SIGALRM is POSIX only; on Windows files are scanned without a time limit
+    if hasattr(signal, 'setitimer'):
+        return _WORKER_SCANNER.file_timeout
+    return 0
+
+def _init_scan_worker(scanner):
+    global _WORKER_SCANNER
+    _WORKER_SCANNER = scanner
+    if _worker_timeout():
+        signal.signal(signal.SIGALRM, _raise_scan_timeout)
+
+def _prefetch_file(file_path):
+    # Start the kernel reading the file in the background; read errors are reported by _read_file
+    try:
+        fd = os.open(file_path, READ_FLAGS)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _scan_batch_in_worker(items, decode_unicode):
+    # A pattern that backtracks catastrophically on one file must not stall the whole batch
+    timeout = _worker_timeout()
+    prefetch = hasattr(os, 'posix_fadvise')
+    results = []
+    for index, (file_path, rel_path) in enumerate(items):
+        # The next file is read from disk while this one is being matched
+        if prefetch and index + 1 < len(items):
+            _prefetch_file(items[index + 1][0])
+        try:
+            if timeout:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                file_findings = _WORKER_SCANNER.scan_file(file_path, rel_path, decode_unicode)
+            finally:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except ScanTimeout:
+            console.print(f"[yellow][WARNING] Skipped {rel_path}: scan took longer than {timeout}s[/yellow]")
+            file_findings = None
+        except Exception as e:
+            console.print(f"[red][ERROR] Error processing file {rel_path}: {e}[/red]")
+            file_findings = None
+        results.append(file_findings)
+    return results
+
+def batch_files(sized_files, batch_count):
+    """
+    Splits (path, size) pairs, in order, into up to batch_count batches of paths with roughly equal total size.
+    """
+    target = max(sum(size for _, size in sized_files) / max(batch_count, 1), 1)
+    batches = []
+    batch = []
+    batch_size = 0
+    for file, size in sized_files:
+        batch.append(file)
+        batch_size += size
+        if batch_size >= target:
+            batches.append(batch)
+            batch = []
+            batch_size = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def scan_directory(path, extensions=None):
+    """
+    Yields (path, size) pairs for files with a supported extension under path; paths are strings.
+    Excluded directories are pruned and files over MAX_FILE_SIZE are skipped.
+    """
     target_path = Path(path).resolve()
     if target_path.is_file():
-        return [target_path]
+        size = target_path.stat().st_size
+        if size <= MAX_FILE_SIZE:
+            yield str(target_path), size
+        return
     if not target_path.exists():
         console.print(f"[red][ERROR] Path does not exist: {target_path}[/red]")
-        return []
-    files = []
-    extensions = extensions or SUPPORTED_EXTENSIONS
-    async def scan_dir(dir_path):
+        return
+    suffixes = frozenset(ext.lstrip('.').lower() for ext in extensions) if extensions else EXT_NO_DOT
+    stack = [str(target_path)]
+    while stack:
+        dir_path = stack.pop()
         try:
             with os.scandir(dir_path) as entries:
                 for entry in entries:
-                    if entry.is_dir():
+                    if entry.is_dir(follow_symlinks=False):
                         if entry.name not in EXCLUDE_DIRS:
-                            await scan_dir(entry.path)
+                            stack.append(entry.path)
                     elif entry.is_file():
-                        if Path(entry.path).suffix in extensions:
-                            files.append(Path(entry.path))
-                            await asyncio.sleep(0)
+                        name = entry.name
+                        # Same rule as Path.suffix: a leading dot does not start an extension
+                        dot = name.rfind('.')
+                        if dot > 0 and name[dot + 1:].lower() in suffixes:
+                            try:
+                                size = entry.stat().st_size
+                            except OSError:
+                                continue
+                            if size <= MAX_FILE_SIZE:
+                                yield entry.path, size
         except PermissionError:
             console.print(f"[yellow][WARNING] Permission denied: {dir_path}[/yellow]")
         except Exception as e:
             console.print(f"[yellow][WARNING] Error scanning {dir_path}: {e}[/yellow]")
-    await scan_dir(target_path)
-    return files
+
+def decode_string(content: str) -> str:
+    """
+    Decodes unicode-escaped sequences such as \\uXXXX; returns content unchanged if they are malformed.
+    """
+    if '\\' not in content:
+        return content
+    try:
+        # backslashreplace keeps characters outside Latin-1 as escapes, so they survive the decode
+        decoded = content.encode('latin-1', 'backslashreplace').decode('unicode-escape')
+    except UnicodeDecodeError:
+        return content
+    if SURROGATE_RE.search(decoded):
+        # Join escaped surrogate pairs into one character; unpaired halves become U+FFFD
+        decoded = decoded.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+    return decoded
 
 def decode_file(path: str) -> None:
     """
     Reads file content, decodes unicode-escaped sequences and overwrites the file.
+    Scanning uses decode_string on the content instead and never rewrites files.
     """
     try:
         # Read original content
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Decode \uXXXX sequences
-        try:
-            decoded = content.encode('utf-8').decode('unicode-escape')
-        except UnicodeDecodeError:
-            # Fallback for files that can't be decoded as unicode-escape
-            decoded = content
+        decoded = decode_string(content)
 
         # Overwrite file with decoded content
         with open(path, 'w', encoding='utf-8') as f:
@@ -321,6 +712,18 @@ def decode_file(path: str) -> None:
     except Exception as e:
         console.print(f"[red]✗ Error decoding file '{path}': {e}[/red]")
 
+def non_negative_float(value: str) -> float:
+    """
+    argparse type for options that take a number of seconds, 0 or more.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Sensitive data scanner')
     parser.add_argument('-t', '--target',
@@ -331,6 +734,10 @@ def parse_arguments():
                       help='Use large pattern set (sensitive_patterns_big.py)')
     parser.add_argument('-c', '--cache', 
                       help='Path to directory for caching')
+    parser.add_argument('--cache-hash', action='store_true',
+                      help='Key cache entries by file content hash instead of size and modification time')
+    parser.add_argument('--file-timeout', type=non_negative_float, default=FILE_SCAN_TIMEOUT,
+                      help='Seconds allowed for scanning one file before it is skipped (default: 0, no limit)')
     parser.add_argument('-s', '--search',
                       help='Search for specific string in files')
     parser.add_argument('-ud', '--decode-unicode', action='store_true',
@@ -388,17 +795,18 @@ async def main_async():
         if os.path.isfile(args.domains):
             try:
                 with open(args.domains, 'r', encoding='utf-8') as f:
-                    custom_domains = [line.strip() for line in f if line.strip()]
+                    custom_domains = [line for line in map(str.strip, f) if line]
                 console.print(f"[cyan]Loaded custom domains from file: {args.domains}[/cyan]")
             except Exception as e:
                 console.print(f"[red][ERROR] Failed to read domains file: {e}[/red]")
         else:
-            custom_domains = [d.strip() for d in args.domains.split(',') if d.strip()]
+            custom_domains = [d for d in map(str.strip, args.domains.split(',')) if d]
             if custom_domains:
                 console.print(f"[cyan]Using custom domains: {', '.join(custom_domains)}[/cyan]")
             else:
                 console.print(f"[yellow][WARN] Failed to parse domains from string: {args.domains}[/yellow]")
-    scanner = OptimizedScanner(custom_domains, cache_dir=args.cache, search_term=args.search)
+    scanner = OptimizedScanner(custom_domains, cache_dir=args.cache, search_term=args.search,
+                               cache_hash=args.cache_hash, file_timeout=args.file_timeout)
     if args.search:
         console.print(f"[cyan]Searching for string: {args.search}[/cyan]")
     if args.decode_unicode:
@@ -434,7 +842,7 @@ async def main_async():
         files = []
         try:
             with open(args.url_file, 'r', encoding='utf-8') as f:
-                urls = [line.strip() for line in f if line.strip()]
+                urls = [line for line in map(str.strip, f) if line]
                 console.print(f"[cyan]Found URLs for scanning: {len(urls)}[/cyan]")
                 for url in urls:
                     if url:
@@ -462,7 +870,8 @@ async def main_async():
             sys.exit(1)
     else:
         # Local scanning
-        files = await scan_directory_async(args.target, decode_unicode=args.decode_unicode)
+        sized_files = list(scan_directory(args.target))
+        files = [file for file, _ in sized_files]
         if not files:
             console.print("[yellow]No files to scan[/yellow]")
             sys.exit(0)
@@ -477,6 +886,7 @@ async def main_async():
     # For web scanning use absolute paths
     if args.url or args.url_file:
         files = [Path(file).resolve() for file in files]
+        sized_files = [(file, _file_size(file)) for file in files]
     
     with Progress(
         SpinnerColumn(),
@@ -487,24 +897,22 @@ async def main_async():
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Scanning files...", total=len(files))
-        tasks = [scanner.analyze_file_async(file, base_path, args.decode_unicode) for file in files]
-        for completed_task in asyncio.as_completed(tasks):
-            try:
-                file_results = await completed_task
-                results.extend(file_results)
-            except Exception as e:
-                console.print(f"[red][ERROR] Error processing file: {e}[/red]")
-            finally:
-                progress.update(task, advance=1)
+        async def scan_batch(batch):
+            return len(batch), await scanner.analyze_batch_async(batch, base_path, args.decode_unicode)
+        # A few batches per worker keeps the pool busy when some files are slower to scan
+        batches = batch_files(sized_files, scanner.max_workers * 4)
+        for completed_task in asyncio.as_completed([scan_batch(batch) for batch in batches]):
+            batch_len, batch_results = await completed_task
+            results.extend(batch_results)
+            progress.update(task, advance=batch_len)
+    scanner.close()
     raw_output_path = OUTPUT_DIR / 'raw_scan_results.json'
-    with open(raw_output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    write_json(raw_output_path, results)
     console.print(f"[green]Raw results saved to file {raw_output_path}[/green]")
     finder = DuplicateFinder()
     cleaned_results = finder.clean_duplicates(results)
     cleaned_output_path = OUTPUT_DIR / 'scan_results.json'
-    with open(cleaned_output_path, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_results, f, ensure_ascii=False, indent=2)
+    write_json(cleaned_output_path, cleaned_results)
     console.print(f"[green]Cleaned results saved to file {cleaned_output_path}[/green]")
     display_results_optimized(cleaned_results)
     elapsed_time = time.perf_counter() - start_time
@@ -519,7 +927,10 @@ async def main_async():
 def main():
     console.print(BANNER)
     console.print("\n")
-    asyncio.run(main_async())
+    if uvloop is not None:
+        uvloop.run(main_async())
+    else:
+        asyncio.run(main_async())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,16 +1,26 @@
 import json
 import hashlib
 import re
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from difflib import SequenceMatcher
+from .json_io import load_json, write_json
 
 # Define path to output folder
 OUTPUT_DIR = Path('output')
 
+# Snippet normalization patterns, compiled once
+WHITESPACE_RE = re.compile(r'\s+')
+NON_WORD_RE = re.compile(r'[^\w\s]+')
+
+# Results compared between progress bar updates
+PROGRESS_STEP = 1024
+
 class DuplicateFinder:
     """
     Class for finding duplicates in scan results.
@@ -26,6 +36,7 @@ class DuplicateFinder:
         self.similarity_threshold = similarity_threshold
         self.console = Console()
         self.content_hashes: Dict[str, List[Dict]] = {}
+        self.snippet_hashes: Dict[str, str] = {}
         
     def _calculate_content_hash(self, content: str) -> str:
         """
@@ -35,32 +46,59 @@ class DuplicateFinder:
             content: Text to hash
             
         Returns:
-            str: MD5 hash of normalized text
+            str: BLAKE2b hash of normalized text
         """
         # Normalize text:
         # 1. Convert to lowercase
         # 2. Remove extra spaces
         # 3. Remove special characters
-        # 4. Normalize URLs and paths
+        # URL schemes and dots in hostnames go with the special characters,
+        # so no separate URL normalization is needed
         normalized = content.lower().strip()
-        normalized = re.sub(r'\s+', ' ', normalized)
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        normalized = re.sub(r'(https?://)?(www\.)?', '', normalized)
-        normalized = re.sub(r'\.internal\.', 'internal', normalized)
-        return hashlib.md5(normalized.encode()).hexdigest()
+        normalized = WHITESPACE_RE.sub(' ', normalized)
+        normalized = NON_WORD_RE.sub('', normalized)
+        return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+    def _snippet_hash(self, snippet: str) -> str:
+        """
+        Returns the content hash of a snippet, computing it once per distinct snippet.
         
-    def _calculate_similarity(self, str1: str, str2: str) -> float:
+        Args:
+            snippet: Snippet of a scan result
+            
+        Returns:
+            str: BLAKE2b hash of normalized snippet
         """
-        Calculates similarity between two strings.
+        content_hash = self.snippet_hashes.get(snippet)
+        if content_hash is None:
+            content_hash = self.snippet_hashes[snippet] = self._calculate_content_hash(snippet)
+        return content_hash
         
+    def _is_similar(self, str1: str, str2: str) -> Tuple[bool, float]:
+        """
+        Checks two strings against the similarity threshold.
+
+        The cheap quick-ratio upper bounds reject most pairs before the
+        quadratic full match is computed.
+
         Args:
             str1: First string
             str2: Second string
-            
+
         Returns:
-            float: Similarity coefficient from 0 to 1
+            Tuple[bool, float]: Whether the strings are similar, and their similarity
         """
-        return SequenceMatcher(None, str1, str2).ratio()
+        if str1 == str2:
+            return True, 1.0
+        # real_quick_ratio() from the lengths alone, before SequenceMatcher indexes str2
+        len1, len2 = len(str1), len(str2)
+        if 2.0 * min(len1, len2) / (len1 + len2) < self.similarity_threshold:
+            return False, 0.0
+        matcher = SequenceMatcher(None, str1, str2)
+        if matcher.quick_ratio() < self.similarity_threshold:
+            return False, 0.0
+        similarity = matcher.ratio()
+        return similarity >= self.similarity_threshold, similarity
         
     def find_duplicates(self, scan_results: List[Dict]) -> List[Tuple[Dict, Dict, float]]:
         """
@@ -84,29 +122,29 @@ class DuplicateFinder:
             task = progress.add_task("Searching for duplicates...", total=len(scan_results))
             
             # Group results by data type
-            results_by_type = {}
+            results_by_type = defaultdict(list)
             for result in scan_results:
-                result_type = result['type']
-                if result_type not in results_by_type:
-                    results_by_type[result_type] = []
-                results_by_type[result_type].append(result)
+                results_by_type[result['type']].append(result)
             
             # Search for duplicates in each group
             for result_type, type_results in results_by_type.items():
                 for i, result1 in enumerate(type_results):
                     content1 = result1['snippet']
-                    content_hash1 = self._calculate_content_hash(content1)
+                    content_hash1 = self._snippet_hash(content1)
                     
                     if content_hash1 in self.content_hashes:
                         for result2 in self.content_hashes[content_hash1]:
-                            if result1 != result2:
-                                similarity = self._calculate_similarity(content1, result2['snippet'])
-                                if similarity >= self.similarity_threshold:
+                            if result1 is not result2:
+                                similar, similarity = self._is_similar(content1, result2['snippet'])
+                                if similar:
                                     duplicates.append((result1, result2, similarity))
                     else:
                         self.content_hashes[content_hash1] = [result1]
                     
-                    progress.advance(task)
+                    if (i + 1) % PROGRESS_STEP == 0:
+                        progress.advance(task, PROGRESS_STEP)
+                
+                progress.advance(task, len(type_results) % PROGRESS_STEP)
                     
         return duplicates
 
@@ -121,12 +159,9 @@ class DuplicateFinder:
             List[Dict]: Cleaned list of results
         """
         # Group results by data type
-        results_by_type = {}
+        results_by_type = defaultdict(list)
         for result in scan_results:
-            result_type = result['type']
-            if result_type not in results_by_type:
-                results_by_type[result_type] = []
-            results_by_type[result_type].append(result)
+            results_by_type[result['type']].append(result)
         
         cleaned_results = []
         
@@ -137,15 +172,12 @@ class DuplicateFinder:
             
             for result in type_results:
                 # Normalize value for comparison
-                normalized_value = self._calculate_content_hash(result['snippet'])
+                normalized_value = self._snippet_hash(result['snippet'])
                 
-                if normalized_value not in seen_values:
+                # If duplicate found, choose result with shorter file path
+                existing_result = seen_values.get(normalized_value)
+                if existing_result is None or len(result['file']) < len(existing_result['file']):
                     seen_values[normalized_value] = result
-                else:
-                    # If duplicate found, choose result with shorter file path
-                    existing_result = seen_values[normalized_value]
-                    if len(result['file']) < len(existing_result['file']):
-                        seen_values[normalized_value] = result
             
             cleaned_results.extend(seen_values.values())
         
@@ -174,14 +206,15 @@ class DuplicateFinder:
         table.add_column("Line 2", justify="right", style="green")
         table.add_column("Similarity", justify="right", style="yellow")
         
+        # Text cells are not parsed as markup, so brackets in types and paths are shown as-is
         for result1, result2, similarity in duplicates:
             table.add_row(
-                result1['type'],
-                result1['file'],
-                str(result1['line']),
-                result2['file'],
-                str(result2['line']),
-                f"{similarity:.2%}"
+                Text(result1['type']),
+                Text(result1['file']),
+                Text(str(result1['line'])),
+                Text(result2['file']),
+                Text(str(result2['line'])),
+                Text(f"{similarity:.2%}")
             )
             
         self.console.print(table)
@@ -195,8 +228,7 @@ def main():
     # Load scan results
     try:
         raw_output_path = OUTPUT_DIR / 'raw_scan_results.json'
-        with open(raw_output_path, 'r', encoding='utf-8') as f:
-            scan_results = json.load(f)
+        scan_results = load_json(raw_output_path)
     except FileNotFoundError:
         console.print("[red]Scan results file not found![/red]")
         return
@@ -212,8 +244,7 @@ def main():
     
     # Save cleaned results
     cleaned_output_path = OUTPUT_DIR / 'scan_results.json'
-    with open(cleaned_output_path, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_results, f, ensure_ascii=False, indent=2)
+    write_json(cleaned_output_path, cleaned_results)
     console.print(f"[green]Cleaned results saved to file {cleaned_output_path}[/green]")
 
 if __name__ == "__main__":
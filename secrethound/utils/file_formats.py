@@ -1,10 +1,11 @@
 """
 Configuration of supported file formats for SecretHound
 All formats are organized by categories for convenient editing
+Lookup tables are frozen; extensions are stored lowercase
 """
 
 # Main supported extensions for local scanning
-SUPPORTED_EXTENSIONS = {
+SUPPORTED_EXTENSIONS = frozenset(ext.lower() for ext in {
     # Programming
     ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".c", ".cpp", ".h", ".hpp", 
     ".rb", ".php", ".cs", ".go", ".rs", ".swift", ".kt", ".scala", ".clj",
@@ -13,12 +14,12 @@ SUPPORTED_EXTENSIONS = {
     
     # Web technologies
     ".html", ".htm", ".xml", ".xhtml", ".shtml", ".asp", ".aspx", ".jsp", ".jspx",
-    ".php", ".phtml", ".erb", ".haml", ".slim", ".vue", ".svelte", ".astro",
+    ".phtml", ".erb", ".haml", ".slim", ".vue", ".svelte", ".astro",
     
     # Configuration files
     ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", ".config",
     ".env", ".env.local", ".env.production", ".env.development", ".env.test",
-    ".properties", ".xml", ".xaml", ".yaml", ".yml", ".lock", ".lockfile",
+    ".properties", ".xaml", ".lock", ".lockfile",
     
     # Documentation and text files
     ".md", ".markdown", ".rst", ".txt", ".text", ".log", ".out", ".err",
@@ -44,7 +45,7 @@ SUPPORTED_EXTENSIONS = {
     ".kubernetes.yml", ".kubernetes.yaml", ".helm.yml", ".helm.yaml",
     
     # CI/CD and DevOps
-    ".travis.yml", ".gitlab-ci.yml", ".github/workflows/*.yml", ".github/workflows/*.yaml",
+    ".travis.yml", ".gitlab-ci.yml",
     ".jenkins", ".jenkinsfile", ".bitbucket-pipelines.yml", ".appveyor.yml",
     ".circleci/config.yml", ".drone.yml", ".semaphore.yml",
     
@@ -57,7 +58,7 @@ SUPPORTED_EXTENSIONS = {
     
     # System files
     ".system", ".service", ".socket", ".timer", ".path", ".mount", ".automount",
-    ".swap", ".target", ".slice", ".scope", ".device", ".mount", ".automount",
+    ".swap", ".target", ".slice", ".scope", ".device",
     
     # Network configurations
     ".hosts", ".resolv.conf", ".nsswitch.conf", ".netrc", ".ssh/config",
@@ -68,12 +69,12 @@ SUPPORTED_EXTENSIONS = {
     ".firewall", ".iptables", ".ufw", ".fail2ban", ".modsecurity",
     
     # Monitoring and logs
-    ".log", ".out", ".err", ".access", ".error", ".debug", ".info", ".warn",
+    ".access", ".error", ".debug", ".info", ".warn",
     ".audit", ".security", ".auth", ".syslog", ".messages", ".kern", ".daemon",
     
     # Virtualization and containers
     ".vbox", ".vmdk", ".vdi", ".vhd", ".vhdx", ".qcow2", ".raw", ".img",
-    ".iso", ".ova", ".ovf", ".vapp", ".vappx", ".vhd", ".vhdx",
+    ".iso", ".ova", ".ovf", ".vapp", ".vappx",
     
     # Cloud services
     ".tf", ".tfvars", ".tfstate", ".tfstate.backup", ".terraform.lock.hcl",
@@ -86,11 +87,11 @@ SUPPORTED_EXTENSIONS = {
     # Additional formats
     ".rpm", ".deb", ".apk", ".ipa", ".dmg", ".pkg", ".msi", ".exe",
     ".dll", ".so", ".dylib", ".a", ".lib", ".o", ".obj", ".class",
-    ".jar", ".war", ".ear", ".apk", ".aab", ".ipa", ".app", ".bundle"
-}
+    ".jar", ".war", ".ear", ".aab", ".app", ".bundle"
+})
 
 # File extensions for web scanning
-WEB_TARGET_EXTENSIONS = {
+WEB_TARGET_EXTENSIONS = frozenset(ext.lower() for ext in {
     # Web technologies
     '.js', '.ts', '.jsx', '.tsx', '.json', '.xml', '.html', '.htm', 
     '.css', '.scss', '.sass', '.less', '.txt', '.md', '.yaml', '.yml',
@@ -108,7 +109,7 @@ WEB_TARGET_EXTENSIONS = {
     'go.mod', 'pubspec.yaml', 'mix.exs',
     
     # CI/CD files
-    '.travis.yml', '.gitlab-ci.yml', '.github/workflows/*.yml',
+    '.travis.yml', '.gitlab-ci.yml',
     '.jenkins', '.jenkinsfile', '.circleci/config.yml',
     
     # Documentation
@@ -132,28 +133,25 @@ WEB_TARGET_EXTENSIONS = {
     '.csv', '.tsv', '.xls', '.xlsx', '.ods', '.sql', '.db',
     '.bak', '.backup', '.old', '.orig', '.tmp', '.temp',
     '.cache', '.session', '.cookie', '.localstorage'
-}
+})
 
 # CDN domains to exclude during web scanning
-CDN_DOMAINS = {
+CDN_DOMAINS = frozenset({
     'cdnjs.cloudflare.com', 'unpkg.com', 'jsdelivr.net',
     'code.jquery.com', 'cdn.jsdelivr.net', 'stackpath.bootstrapcdn.com',
-    'cdn.jsdelivr.net', 'cdnjs.cloudflare.com', 'unpkg.com',
     'cdn.skypack.dev', 'esm.sh', 'cdn.esm.sh', 'jspm.dev',
-    'unpkg.com', 'jsdelivr.net', 'cdnjs.cloudflare.com',
     'fonts.googleapis.com', 'fonts.gstatic.com', 'ajax.googleapis.com',
     'maps.googleapis.com', 'www.google-analytics.com',
     'www.googletagmanager.com', 'www.gstatic.com',
-    'cdn.rawgit.com', 'raw.githubusercontent.com',
-    'cdn.jsdelivr.net', 'cdnjs.cloudflare.com', 'unpkg.com'
-}
+    'cdn.rawgit.com', 'raw.githubusercontent.com'
+})
 
 # Excluded directories
-EXCLUDE_DIRS = {
+EXCLUDE_DIRS = frozenset({
     ".git", "__pycache__", "venv", "node_modules", ".vscode",
-    ".idea", ".vscode", ".DS_Store", "Thumbs.db", ".Trash",
-    "node_modules", "bower_components", "vendor", "dist", "build",
+    ".idea", ".DS_Store", "Thumbs.db", ".Trash",
+    "bower_components", "vendor", "dist", "build",
     "target", "bin", "obj", ".gradle", ".mvn", ".sass-cache",
-    "coverage", ".nyc_output", ".nyc_output", ".nyc_output",
+    "coverage", ".nyc_output",
     "tmp", "temp", "cache", ".cache", "logs", "log"
-} 
\ No newline at end of file
+}) 
\ No newline at end of file
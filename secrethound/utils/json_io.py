@@ -0,0 +1,38 @@
+"""
+Reading and writing of result JSON files, using orjson when it is installed
+"""
+import os
+import json
+import mmap
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional, see the "fast" extra
+    orjson = None
+
+
+def load_json(path):
+    """
+    Loads a JSON file; with orjson it is parsed straight from a memory map, without a copy of the file.
+    """
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped; orjson reports them as a decode error
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def write_json(path, data) -> None:
+    """
+    Writes data as indented UTF-8 JSON, using orjson when it is installed.
+    """
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,41 @@
+"""
+Compact regular expressions for large sets of literal words
+"""
+import re
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return trie
+
+
+def _trie_regex(node):
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+    alternation = f"(?:{'|'.join(branches)})"
+    return alternation + "?" if '' in node else alternation
+
+
+def words_regex(words) -> str:
+    """
+    Builds a regex matching any of the given words, with shared prefixes matched once.
+
+    A flat alternation makes the engine try every word in turn at each position; the trie
+    form only follows the branches that fit. Longer words are tried before a word that is
+    their prefix, so the longest matching word wins.
+
+    Args:
+        words: Literal words to match
+
+    Returns:
+        str: Regex source for the words, without an enclosing group
+    """
+    return _trie_regex(_build_trie(words))
@@ -1,4 +1,34 @@
 import re
+
+from .regex_trie import words_regex
+
+# Mail providers and top-level domains for 'Personal Email', compiled into prefix tries;
+# sensitive_patterns_big imports them from here
+EMAIL_PROVIDERS = (
+    'gmail', 'yahoo', 'hotmail', 'outlook', 'mail', 'yandex', 'protonmail', 'icloud', 'aol',
+    'zoho', 'mailru', 'ya', 'bk', 'list', 'inbox', 'rambler', 'ukr'
+)
+EMAIL_TLDS = (
+    'com', 'ru', 'net', 'org', 'info', 'co', 'ua', 'kz', 'by', 'me', 'in', 'fr', 'de', 'es',
+    'it', 'nl', 'pl', 'se', 'no', 'dk', 'fi', 'jp', 'cn', 'hk', 'sg', 'au', 'ca', 'mx', 'br',
+    'ar', 'cl', 'pe', 've', 'pk', 'bd', 'np', 'lk', 'ph', 'my', 'th', 'vn', 'kr', 'sa', 'ae',
+    'qa', 'om', 'kw', 'eg', 'ma', 'dz', 'tn', 'ng', 'ke', 'za', 'gh', 'ci', 'sn', 'cm', 'ga',
+    'cd', 'cg', 'ao', 'mz', 'tz', 'ug', 'et', 'sd', 'so', 'dj', 'er', 'rw', 'bi', 'mg', 'mu',
+    're', 'sc', 'km', 'mv', 'fm', 'pw', 'mh', 'tv', 'ki', 'to', 'ws', 'fj', 'sb', 'vu', 'nc',
+    'pf', 'ck', 'nu', 'tk', 'wf', 'ht', 'cu', 'jm', 'bb', 'bs', 'ag', 'gd', 'lc', 'vc', 'ms',
+    'pr', 'vi', 'ai', 'bm', 'ky', 'vg', 'tc', 'mp', 'gu', 'as', 'um', 'ac', 'ad', 'af', 'al',
+    'am', 'an', 'aq', 'at', 'aw', 'ax', 'az', 'ba', 'be', 'bf', 'bg', 'bh', 'bj', 'bl', 'bn',
+    'bo', 'bq', 'bt', 'bv', 'bw', 'bz', 'cc', 'cf', 'ch', 'cr', 'cv', 'cw', 'cx', 'cy', 'cz',
+    'dm', 'do', 'ec', 'ee', 'eh', 'eu', 'fk', 'fo', 'gb', 'ge', 'gf', 'gg', 'gi', 'gl', 'gm',
+    'gn', 'gp', 'gq', 'gr', 'gs', 'gt', 'gw', 'gy', 'hm', 'hn', 'hr', 'hu', 'id', 'ie', 'il',
+    'im', 'io', 'iq', 'ir', 'is', 'je', 'jo', 'kg', 'kh', 'kn', 'kp', 'la', 'lb', 'li', 'lr',
+    'ls', 'lt', 'lu', 'lv', 'ly', 'mc', 'md', 'mf', 'mk', 'ml', 'mm', 'mn', 'mo', 'mq', 'mr',
+    'mt', 'mw', 'na', 'ne', 'nf', 'ni', 'nr', 'nz', 'pa', 'pg', 'pm', 'pn', 'ps', 'pt', 'py',
+    'ro', 'rs', 'sh', 'si', 'sj', 'sk', 'sl', 'sm', 'sr', 'ss', 'st', 'su', 'sv', 'sx', 'sy',
+    'sz', 'td', 'tf', 'tg', 'tj', 'tl', 'tm', 'tp', 'tr', 'tt', 'tw', 'uk', 'us', 'uy', 'uz',
+    'va', 'ye', 'yt', 'zm', 'zw'
+)
+
 # Unified dictionary of patterns for searching sensitive data,
 # ordered by significance of information for attackers
 PATTERNS = {
@@ -69,7 +99,7 @@ PATTERNS = {
     'Email Address':        re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
 
     'Personal Email': re.compile(
-        r'\b[A-Za-z0-9._%+-]+@(?:gmail|yahoo|hotmail|outlook|mail|yandex|protonmail|icloud|aol|zoho|mailru|ya|bk|list|inbox|rambler|ukr)\.(?:com|ru|net|org|info|co|ua|kz|by|me|in|fr|de|es|it|nl|pl|se|no|dk|fi|jp|cn|hk|sg|au|ca|mx|br|ar|cl|pe|co|ve|in|pk|bd|np|lk|ph|my|th|vn|kr|sa|ae|qa|om|kw|eg|ma|dz|tn|ng|ke|za|gh|ci|sn|cm|ga|cd|cg|ao|mz|tz|ug|et|sd|so|dj|er|rw|bi|mg|mu|re|sc|km|mv|fm|pw|mh|tv|ki|to|ws|fj|sb|vu|nc|pf|ck|nu|tk|wf|ht|cu|jm|bb|bs|ag|gd|lc|vc|ms|pr|vi|ai|bm|ky|vg|tc|mp|gu|as|um|ac|ad|ae|af|ag|ai|al|am|an|ao|aq|ar|as|at|au|aw|ax|az|ba|bb|bd|be|bf|bg|bh|bi|bj|bl|bm|bn|bo|bq|br|bs|bt|bv|bw|by|bz|ca|cc|cd|cf|cg|ch|ci|ck|cl|cm|cn|co|cr|cu|cv|cw|cx|cy|cz|de|dj|dk|dm|do|dz|ec|ee|eg|eh|er|es|et|eu|fi|fj|fk|fm|fo|fr|ga|gb|gd|ge|gf|gg|gh|gi|gl|gm|gn|gp|gq|gr|gs|gt|gu|gw|gy|hk|hm|hn|hr|ht|hu|id|ie|il|im|in|io|iq|ir|is|it|je|jm|jo|jp|ke|kg|kh|ki|km|kn|kp|kr|kw|ky|kz|la|lb|lc|li|lk|lr|ls|lt|lu|lv|ly|ma|mc|md|me|mf|mg|mh|mk|ml|mm|mn|mo|mp|mq|mr|ms|mt|mu|mv|mw|mx|my|mz|na|nc|ne|nf|ng|ni|nl|no|np|nr|nu|nz|om|pa|pe|pf|pg|ph|pk|pl|pm|pn|pr|ps|pt|pw|py|qa|re|ro|rs|ru|rw|sa|sb|sc|sd|se|sg|sh|si|sj|sk|sl|sm|sn|so|sr|ss|st|su|sv|sx|sy|sz|tc|td|tf|tg|th|tj|tk|tl|tm|tn|to|tp|tr|tt|tv|tw|tz|ua|ug|uk|um|us|uy|uz|va|vc|ve|vg|vi|vn|vu|wf|ws|ye|yt|za|zm|zw)\b',
+        r'\b[A-Za-z0-9._%+-]+@(?:' + words_regex(EMAIL_PROVIDERS) + r')\.(?:' + words_regex(EMAIL_TLDS) + r')\b',
         re.IGNORECASE
     ),
     'Phone Number':         re.compile(r"\+?(\d{1,3}[\s\-\.]?)?\(?\d{3,4}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{2,4}[\s\-\.]?\d{2,4}"),
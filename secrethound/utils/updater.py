@@ -7,64 +7,76 @@ import subprocess
 import sys
 import os
 import re
+import shlex
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 console = Console()
 
+# Fixed versions replaced with minimum requirements by clean_dependencies
+VERSION_REPLACEMENTS = tuple((re.compile(pattern), replacement) for pattern, replacement in [
+    (r'rich>=14\.1\.0', 'rich>=14.0.0'),
+    (r'typer>=0\.16\.0', 'typer>=0.9.0'),
+    (r'aiofiles>=24\.1\.0', 'aiofiles>=23.0.0'),
+    (r'aiohttp>=3\.12\.0', 'aiohttp>=3.8.0'),
+    (r'pytest>=7\.4\.3', 'pytest>=7.0.0'),
+    (r'pytest-asyncio>=0\.21\.1', 'pytest-asyncio>=0.21.0'),
+    (r'pytest-cov>=4\.1\.0', 'pytest-cov>=4.0.0')
+])
+
+# Project version line in pyproject.toml
+VERSION_RE = re.compile(r'version = "(\d+\.\d+\.\d+)"')
+
+def _search_project_root(start: Path) -> Optional[Path]:
+    """Returns the nearest directory from start upwards that contains pyproject.toml"""
+    search_path = start
+    while search_path != search_path.parent:
+        if (search_path / "pyproject.toml").exists():
+            return search_path
+        search_path = search_path.parent
+    return None
+
+@lru_cache(maxsize=None)
+def _find_project_root(current_path: Path) -> Optional[Path]:
+    """
+    Finds the project root directory, searched once per working directory.
+    The module's own location is tried first, then the working directory.
+    """
+    try:
+        project_root = _search_project_root(Path(__file__).parent)
+    except Exception:
+        project_root = None
+    return project_root or _search_project_root(current_path)
+
 class SecretHoundUpdater:
     """Class for automatic updating of SecretHound"""
     
     def __init__(self):
-        # Try to find project root directory
         current_path = Path.cwd()
-        self.project_root = None
-        self.pyproject_path = None
-        self.requirements_path = None
-        
-        # First try to find through relative path from module
-        try:
-            module_path = Path(__file__)
-            # Look for pyproject.toml in parent directories from module
-            search_path = module_path.parent
-            while search_path != search_path.parent:
-                pyproject_candidate = search_path / "pyproject.toml"
-                if pyproject_candidate.exists():
-                    self.project_root = search_path
-                    self.pyproject_path = pyproject_candidate
-                    self.requirements_path = search_path / "requirements.txt"
-                    break
-                search_path = search_path.parent
-        except Exception:
-            pass
-        
-        # If not found through module, search in current directory and parent directories
-        if not self.project_root:
-            search_path = current_path
-            while search_path != search_path.parent:
-                pyproject_candidate = search_path / "pyproject.toml"
-                if pyproject_candidate.exists():
-                    self.project_root = search_path
-                    self.pyproject_path = pyproject_candidate
-                    self.requirements_path = search_path / "requirements.txt"
-                    break
-                search_path = search_path.parent
+        self.project_root = _find_project_root(current_path)
+        self.pyproject_path = self.project_root / "pyproject.toml" if self.project_root else None
+        self.requirements_path = self.project_root / "requirements.txt" if self.project_root else None
         
         # Debug information
-        print(f"🔍 Debug: current directory = {current_path}")
-        print(f"🔍 Debug: project_root = {self.project_root}")
-        print(f"🔍 Debug: pyproject_path = {self.pyproject_path}")
-        if self.pyproject_path:
-            print(f"🔍 Debug: pyproject_path.exists() = {self.pyproject_path.exists()}")
-        
-    def run_command(self, cmd: str, description: str) -> Tuple[bool, str]:
+        if os.environ.get("SECRETHOUND_DEBUG"):
+            print(f"🔍 Debug: current directory = {current_path}")
+            print(f"🔍 Debug: project_root = {self.project_root}")
+            print(f"🔍 Debug: pyproject_path = {self.pyproject_path}")
+            if self.pyproject_path:
+                print(f"🔍 Debug: pyproject_path.exists() = {self.pyproject_path.exists()}")
+        
+    def run_command(self, cmd: Union[str, List[str]], description: str) -> Tuple[bool, str]:
         """Executes command and returns result"""
         console.print(f"🔄 {description}...")
         try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            # Run without an intermediate shell
+            if isinstance(cmd, str):
+                cmd = shlex.split(cmd)
+            result = subprocess.run(cmd, capture_output=True, text=True)
             if result.returncode == 0:
                 console.print(f"✅ {description} - success")
                 return True, result.stdout.strip()
@@ -137,15 +149,22 @@ class SecretHoundUpdater:
         """Tests functionality of all project modules"""
         console.print("\n🧪 Testing project modules...")
         
-        tests = [
-            ("python -c 'import secrethound'", "Import main module"),
-            ("python -c 'from secrethound.utils.sensitive_patterns import PATTERNS; print(f\"Loaded {len(PATTERNS)} patterns\")'", "Load standard patterns"),
-            ("python -c 'from secrethound.utils.sensitive_patterns_big import PATTERNS; print(f\"Loaded {len(PATTERNS)} extended patterns\")'", "Load extended patterns"),
-            ("python -c 'from secrethound.utils.duplicate_finder import DuplicateFinder'", "Test DuplicateFinder"),
-            ("python -c 'from secrethound.utils.web_scanner import WebScanner'", "Test WebScanner"),
-            ("python -c 'from secrethound.utils.file_formats import SUPPORTED_EXTENSIONS'", "Test file_formats"),
-            ("python -m secrethound.main --help", "Test CLI interface")
+        imports = [
+            ("import secrethound", "Import main module"),
+            ("from secrethound.utils.sensitive_patterns import PATTERNS", "Load standard patterns"),
+            ("from secrethound.utils.sensitive_patterns_big import PATTERNS", "Load extended patterns"),
+            ("from secrethound.utils.duplicate_finder import DuplicateFinder", "Test DuplicateFinder"),
+            ("from secrethound.utils.web_scanner import WebScanner", "Test WebScanner"),
+            ("from secrethound.utils.file_formats import SUPPORTED_EXTENSIONS", "Test file_formats"),
         ]
+        total = len(imports) + 1
+        
+        # All imports run in one interpreter, each reporting a tagged result line
+        script = "\n".join(
+            f"try:\n    {statement}\n    print('PASS:{index}')\n"
+            f"except Exception as e:\n    print('FAIL:{index}:', e)"
+            for index, (statement, _) in enumerate(imports)
+        )
         
         success_count = 0
         with Progress(
@@ -154,16 +173,40 @@ class SecretHoundUpdater:
             BarColumn(),
             console=console
         ) as progress:
-            task = progress.add_task("Testing modules...", total=len(tests))
+            task = progress.add_task("Testing modules...", total=total)
             
-            for cmd, description in tests:
-                success, _ = self.run_command(cmd, description)
+            console.print(f"🔄 Importing {len(imports)} modules...")
+            try:
+                result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+                output = result.stdout.splitlines()
+                error = result.stderr.strip()
+            except Exception as e:
+                output, error = [], str(e)
+            
+            results = {}
+            for line in output:
+                status, _, rest = line.partition(":")
+                index, _, message = rest.partition(":")
+                if status in ("PASS", "FAIL") and index.isdigit():
+                    results[int(index)] = (status == "PASS", message.strip())
+            
+            for index, (_, description) in enumerate(imports):
+                success, message = results.get(index, (False, error))
                 if success:
+                    console.print(f"✅ {description} - success")
                     success_count += 1
+                else:
+                    console.print(f"❌ {description} - error")
+                    console.print(f"   Error: {message}")
                 progress.advance(task)
+            
+            success, _ = self.run_command([sys.executable, "-m", "secrethound.main", "--help"], "Test CLI interface")
+            if success:
+                success_count += 1
+            progress.advance(task)
         
-        console.print(f"📊 Tested {success_count}/{len(tests)} modules")
-        return success_count == len(tests)
+        console.print(f"📊 Tested {success_count}/{total} modules")
+        return success_count == total
     
     def update_version(self) -> bool:
         """Updates project version"""
@@ -177,7 +220,7 @@ class SecretHoundUpdater:
             content = f.read()
         
         # Look for version line
-        version_match = re.search(r'version = "(\d+\.\d+\.\d+)"', content)
+        version_match = VERSION_RE.search(content)
         if not version_match:
             console.print("❌ Failed to find version in pyproject.toml")
             return False
@@ -187,7 +230,7 @@ class SecretHoundUpdater:
         new_version = f"{major}.{minor}.{patch + 1}"
         
         # Update version
-        new_content = re.sub(r'version = "\d+\.\d+\.\d+"', f'version = "{new_version}"', content)
+        new_content = VERSION_RE.sub(f'version = "{new_version}"', content)
         
         with open(self.pyproject_path, 'w') as f:
             f.write(new_content)
@@ -199,56 +242,25 @@ class SecretHoundUpdater:
         """Cleans dependencies from fixed versions"""
         console.print("\n🧹 Cleaning dependencies from fixed versions...")
         
-        # Update pyproject.toml
-        if self.pyproject_path.exists():
-            with open(self.pyproject_path, 'r') as f:
-                content = f.read()
-            
-            # Replace fixed versions with minimum requirements
-            replacements = [
-                (r'rich>=14\.1\.0', 'rich>=14.0.0'),
-                (r'typer>=0\.16\.0', 'typer>=0.9.0'),
-                (r'aiofiles>=24\.1\.0', 'aiofiles>=23.0.0'),
-                (r'aiohttp>=3\.12\.0', 'aiohttp>=3.8.0'),
-                (r'pytest>=7\.4\.3', 'pytest>=7.0.0'),
-                (r'pytest-asyncio>=0\.21\.1', 'pytest-asyncio>=0.21.0'),
-                (r'pytest-cov>=4\.1\.0', 'pytest-cov>=4.0.0')
-            ]
-            
-            for old, new in replacements:
-                content = re.sub(old, new, content)
-            
-            with open(self.pyproject_path, 'w') as f:
-                f.write(content)
-            
-            console.print("✅ pyproject.toml cleaned from fixed versions")
-        
-        # Update requirements.txt
-        if self.requirements_path.exists():
-            with open(self.requirements_path, 'r') as f:
-                content = f.read()
-            
-            # Replace fixed versions with minimum requirements
-            replacements = [
-                (r'rich>=14\.1\.0', 'rich>=14.0.0'),
-                (r'typer>=0\.16\.0', 'typer>=0.9.0'),
-                (r'aiofiles>=24\.1\.0', 'aiofiles>=23.0.0'),
-                (r'aiohttp>=3\.12\.0', 'aiohttp>=3.8.0'),
-                (r'pytest>=7\.4\.3', 'pytest>=7.0.0'),
-                (r'pytest-asyncio>=0\.21\.1', 'pytest-asyncio>=0.21.0'),
-                (r'pytest-cov>=4\.1\.0', 'pytest-cov>=4.0.0')
-            ]
-            
-            for old, new in replacements:
-                content = re.sub(old, new, content)
-            
-            with open(self.requirements_path, 'w') as f:
-                f.write(content)
-            
-            console.print("✅ requirements.txt cleaned from fixed versions")
+        # Replace fixed versions with minimum requirements
+        for path in (self.pyproject_path, self.requirements_path):
+            if path.exists():
+                self._relax_versions(path)
+                console.print(f"✅ {path.name} cleaned from fixed versions")
         
         return True
     
+    def _relax_versions(self, path: Path) -> None:
+        """Rewrites one dependency file with VERSION_REPLACEMENTS applied"""
+        with open(path, 'r') as f:
+            content = f.read()
+        
+        for pattern, replacement in VERSION_REPLACEMENTS:
+            content = pattern.sub(replacement, content)
+        
+        with open(path, 'w') as f:
+            f.write(content)
+    
     def show_status(self) -> None:
         """Shows current project status"""
         console.print("\n📊 SecretHound Project Status")
@@ -261,7 +273,7 @@ class SecretHoundUpdater:
         if self.pyproject_path.exists():
             with open(self.pyproject_path, 'r') as f:
                 content = f.read()
-            version_match = re.search(r'version = "(\d+\.\d+\.\d+)"', content)
+            version_match = VERSION_RE.search(content)
             if version_match:
                 console.print(f"📦 Project version: {version_match.group(1)}")
         
@@ -284,7 +284,7 @@ class WebScanner:
         
         # Check file extensions
         for ext in self.target_extensions:
-            if path.endswith(ext.lower()):
+            if path.endswith(ext):
                 return True
         
         # Check special files